@@ -1,9 +1,13 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 from datetime import datetime
 import io
-import base64
+import hashlib
+import os
+import re
+import functools
 from fpdf import FPDF
 import plotly.io as pio
 
@@ -35,114 +39,179 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-def convert_rating_to_score(rating):
-    if pd.isna(rating):
-        return None
-    return {
-        'Excellent': 5,
-        'Very Good': 4,
-        'Good': 3,
-        'Fair': 2,
-        'Poor': 1
-    }.get(rating, None)
+# Ordered rating scale; category code + 1 gives the 1..5 numeric score
+RATING_DTYPE = pd.CategoricalDtype(['Poor', 'Fair', 'Good', 'Very Good', 'Excellent'],
+                                   ordered=True)
 
+# Columns backing the filter widgets
+FILTER_COLS = [
+    'Choose your Current/Last Academic Year and Semester',
+    'Gender',
+    'Select Branch/Discipline',
+    'Section Type'
+]
+
+# Matches the "Subjects [<name>]" / "Subject [<name>]" column headers
+_SUBJECT_RE = re.compile(r'Subjects? \[([^\]]+)\]')
+_WS_RE = re.compile(r'\s+')
+
+@functools.lru_cache(maxsize=512)
 def normalize_subject_name(name):
-    if pd.isna(name):
-        return None
-    return ' '.join(str(name).strip().upper().split())
+    # Only a handful of unique header spellings exist, so repeat calls
+    # are served from the cache; callers pass real strings, never NaN
+    return _WS_RE.sub(' ', name).strip().upper()
+
+@st.cache_data(show_spinner=False)
+def load_excel(file_bytes):
+    # Parquet sidecar keyed on the upload's hash: xlsx parsing is the
+    # slow path, re-reading the columnar cache takes milliseconds even
+    # across sessions once st.cache_data has been cleared
+    os.makedirs('.cache', exist_ok=True)
+    # The two apps write different schemas (app7 bakes the "nan" fill
+    # into the filter columns), so the key carries an app/schema tag
+    cache_path = os.path.join('.cache', hashlib.md5(file_bytes).hexdigest() + '-v1-app6.parquet')
+    if os.path.exists(cache_path):
+        return pd.read_parquet(cache_path)
+
+    # Scan just the header row, then re-read only the columns the app
+    # uses so unused survey text columns are never parsed into memory
+    header = pd.read_excel(io.BytesIO(file_bytes), nrows=0).columns
+    keep = [col for col in header
+            if col == 'Timestamp' or col in FILTER_COLS
+            or _SUBJECT_RE.search(col)]
+    df = pd.read_excel(io.BytesIO(file_bytes), usecols=keep)
+    df['Timestamp'] = pd.to_datetime(df['Timestamp'])
+    # Category dtype: the filter mask's .isin() then compares int codes
+    # instead of hashing a Python string per row
+    for col in FILTER_COLS:
+        df[col] = df[col].astype('category')
+    df.to_parquet(cache_path, compression='zstd')
+    return df
 
 def get_sorted_unique_values(df, column):
     unique_values = df[column].dropna().unique().tolist()
     return sorted(unique_values) if unique_values else []
 
-def calculate_average_scores(df):
+@st.cache_data(show_spinner=False)
+def subject_columns(columns):
+    # Parsed once per upload; maps each subject column to its normalized
+    # subject name so spelling variants fold together
+    cols = pd.Index(columns)
+    # One C-level extract over all headers instead of a Python regex
+    # search per column
+    names = cols.str.extract(_SUBJECT_RE, expand=False)
+    matched = names.notna()
+    col_subjects = {}
+    for column, raw_name in zip(cols[matched], names[matched]):
+        subject_name = normalize_subject_name(raw_name)
+        if subject_name:
+            col_subjects[column] = subject_name
+    return col_subjects
+
+@st.cache_data(show_spinner=False)
+def calculate_average_scores(df, col_subjects):
     average_scores = {}
     subject_scores = {}
-    accumulated_scores = {}
-
-    for column in df.columns:
-        if 'Subjects [' in column or 'Subject [' in column:
-            start_idx = column.find('[') + 1
-            end_idx = column.find(']')
-            if start_idx > 0 and end_idx > start_idx:
-                subject_name = normalize_subject_name(column[start_idx:end_idx])
-                if subject_name:  # Only process if subject name is valid
-                    scores = df[column].apply(convert_rating_to_score)
-                    valid_scores = scores.dropna().tolist()
-                    
-                    if valid_scores:
-                        if subject_name not in accumulated_scores:
-                            accumulated_scores[subject_name] = []
-                        accumulated_scores[subject_name].extend(valid_scores)
 
-    for subject_name, scores in accumulated_scores.items():
-        if scores:
-            average_scores[subject_name] = sum(scores) / len(scores)
-            subject_scores[subject_name] = scores
+    if not col_subjects:
+        return average_scores, subject_scores
+
+    # Ordered categorical cast turns the ratings into int8 codes in one
+    # C-level pass; keeping the block as a dense (n_rows, n_cols) int8
+    # matrix (0 = missing after the +1 shift) avoids the long-form copy
+    # that stacking into a Series materialized
+    block = np.column_stack([df[col].astype(RATING_DTYPE).cat.codes.to_numpy()
+                             for col in col_subjects])
+    valid = block >= 0
+    scores = block + 1
+
+    # Columns sharing a normalized subject are folded together; one pair
+    # of bincount kernels yields every subject's sum and count at once
+    # instead of running a mean reduction per group
+    group_ids, group_names = pd.factorize(np.asarray(list(col_subjects.values())))
+    col_sums = np.where(valid, scores, 0).sum(axis=0, dtype=np.int64)
+    col_counts = valid.sum(axis=0, dtype=np.int64)
+    sums = np.bincount(group_ids, weights=col_sums, minlength=len(group_names))
+    counts = np.bincount(group_ids, weights=col_counts, minlength=len(group_names))
+
+    for group_id, subject_name in enumerate(group_names):
+        if counts[group_id]:
+            average_scores[subject_name] = sums[group_id] / counts[group_id]
+            group_cols = group_ids == group_id
+            subject_scores[subject_name] = scores[:, group_cols][valid[:, group_cols]]
 
     return average_scores, subject_scores
 
-def create_pdf_report(scores_df, subject_scores, selected_subjects):
+@st.cache_data(show_spinner=False)
+def compute_distributions(subject_scores):
+    # Each subject's (counts, percentages) pair is computed once and
+    # shared by both tabs and the PDF report
+    distributions = {}
+    for subject, scores in subject_scores.items():
+        counts = np.bincount(scores, minlength=6)[1:]
+        percentages = np.round(counts / counts.sum() * 100, 1)
+        distributions[subject] = (counts, percentages)
+    return distributions
+
+def create_pdf_report(scores_df, distributions, selected_subjects):
     pdf = FPDF()
     pdf.add_page()
     
     # Set up PDF
-    pdf.set_font('Arial', 'B', 16)
+    pdf.set_font('helvetica', 'B', 16)
     pdf.cell(0, 10, 'Faculty Rating Analysis Report', 0, 1, 'C')
     pdf.ln(10)
     
     # Overall scores table
-    pdf.set_font('Arial', 'B', 12)
+    pdf.set_font('helvetica', 'B', 12)
     pdf.cell(0, 10, 'Overall Subject Performance', 0, 1, 'L')
-    pdf.set_font('Arial', '', 10)
-    
-    # Table headers
-    cols = ['Subject', 'Average Score', 'Number of Responses', 'Response Rate (%)']
-    col_widths = [80, 30, 40, 40]
-    
-    for i, col in enumerate(cols):
-        pdf.cell(col_widths[i], 10, col, 1)
-    pdf.ln()
+    pdf.set_font('helvetica', '', 10)
     
-    # Table data
-    for _, row in scores_df.iterrows():
-        pdf.cell(80, 10, str(row['Subject'])[:40], 1)
-        pdf.cell(30, 10, str(row['Average Score']), 1)
-        pdf.cell(40, 10, str(row['Number of Responses']), 1)
-        pdf.cell(40, 10, str(row['Response Rate (%)']), 1)
-        pdf.ln()
+    # fpdf2's table() lays the rows out in batch: one font-layout pass
+    # per column width instead of one per cell
+    with pdf.table(col_widths=(80, 30, 40, 40)) as table:
+        table.row(('Subject', 'Average Score', 'Number of Responses', 'Response Rate (%)'))
+        # itertuples yields plain tuples; iterrows boxed a Series per row
+        for subject, avg, responses, rate in scores_df.itertuples(index=False, name=None):
+            table.row((str(subject)[:40], str(avg), str(responses), str(rate)))
     
     # Detailed breakdown for selected subjects
     pdf.ln(10)
-    pdf.set_font('Arial', 'B', 12)
+    pdf.set_font('helvetica', 'B', 12)
     pdf.cell(0, 10, 'Detailed Score Distribution', 0, 1, 'L')
     
     for subject in selected_subjects:
-        pdf.set_font('Arial', 'B', 11)
+        pdf.set_font('helvetica', 'B', 11)
         pdf.cell(0, 10, f'\n{subject}', 0, 1, 'L')
-        pdf.set_font('Arial', '', 10)
+        pdf.set_font('helvetica', '', 10)
         
-        scores = subject_scores[subject]
-        score_dist = pd.Series(scores).value_counts().sort_index()
-        total = sum(score_dist.values)
-        score_percentages = (score_dist / total * 100).round(1)
+        counts, percentages = distributions[subject]
+        present = counts > 0
         
         # Distribution table
-        pdf.cell(30, 10, 'Score', 1)
-        pdf.cell(30, 10, 'Count', 1)
-        pdf.cell(30, 10, 'Percentage', 1)
-        pdf.ln()
-        
-        for score, count in score_dist.items():
-            pdf.cell(30, 10, str(score), 1)
-            pdf.cell(30, 10, str(count), 1)
-            pdf.cell(30, 10, f"{score_percentages[score]}%", 1)
-            pdf.ln()
+        with pdf.table(col_widths=(30, 30, 30)) as table:
+            table.row(('Score', 'Count', 'Percentage'))
+            for score, count, pct in zip(np.arange(1, 6)[present], counts[present],
+                                         percentages[present]):
+                table.row((str(score), str(count), f"{pct}%"))
         
         pdf.ln(5)
     
     return pdf
 
+@st.cache_data(show_spinner=False)
+def pdf_report_bytes(scores_df, distributions, selected_subjects):
+    pdf = create_pdf_report(scores_df, distributions, selected_subjects)
+    # fpdf2 returns the document as a bytearray directly
+    return bytes(pdf.output())
+
+@st.cache_data(show_spinner=False)
+def render_scores_table(scores_df):
+    # The Styler -> HTML conversion is Python-heavy; cache the rendered
+    # markup so reruns re-emit the same string
+    return (scores_df.style.background_gradient(subset=['Average Score'], cmap='RdYlGn')
+            .hide(axis='index').to_html())
+
 def main():
     st.title("📊 Subject Faculty Rating Analysis")
     
@@ -153,96 +222,106 @@ def main():
 
     if uploaded_file:
         try:
-            df = pd.read_excel(uploaded_file)
-            df['Timestamp'] = pd.to_datetime(df['Timestamp'])
-
-            # Create two columns for date filters
-            col1, col2 = st.columns(2)
-            min_date = df['Timestamp'].min().date()
-            max_date = df['Timestamp'].max().date()
+            # Cached on the raw bytes, so filter reruns skip re-parsing
+            df = load_excel(uploaded_file.getvalue())
+            col_subjects = subject_columns(tuple(df.columns))
+
+            # Filters live in a form: changing them does not rerun
+            # the pipeline until Apply is pressed
+            with st.form("filters"):
+                # Create two columns for date filters
+                col1, col2 = st.columns(2)
+                min_date = df['Timestamp'].min().date()
+                max_date = df['Timestamp'].max().date()
             
-            with col1:
-                from_date = st.date_input("From Date", value=min_date)
-            with col2:
-                to_date = st.date_input("To Date", value=max_date)
+                with col1:
+                    from_date = st.date_input("From Date", value=min_date)
+                with col2:
+                    to_date = st.date_input("To Date", value=max_date)
 
-            # Convert dates
-            from_date = pd.to_datetime(from_date)
-            to_date = pd.to_datetime(to_date) + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
+                # Convert dates
+                from_date = pd.to_datetime(from_date)
+                to_date = pd.to_datetime(to_date) + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
 
-            # Create expander for filters
-            with st.expander("📌 Additional Filters", expanded=False):
-                col1, col2 = st.columns(2)
+                # Create expander for filters
+                with st.expander("📌 Additional Filters", expanded=False):
+                    col1, col2 = st.columns(2)
                 
-                with col1:
-                    year_semester_options = get_sorted_unique_values(df, 'Choose your Current/Last Academic Year and Semester')
-                    selected_year_semesters = st.multiselect(
-                        "Year and Semester",
-                        options=year_semester_options,
-                        default=year_semester_options
-                    )
+                    with col1:
+                        year_semester_options = get_sorted_unique_values(df, 'Choose your Current/Last Academic Year and Semester')
+                        selected_year_semesters = st.multiselect(
+                            "Year and Semester",
+                            options=year_semester_options,
+                            default=year_semester_options
+                        )
 
-                    gender_options = get_sorted_unique_values(df, 'Gender')
-                    selected_genders = st.multiselect(
-                        "Gender",
-                        options=gender_options,
-                        default=gender_options
-                    )
+                        gender_options = get_sorted_unique_values(df, 'Gender')
+                        selected_genders = st.multiselect(
+                            "Gender",
+                            options=gender_options,
+                            default=gender_options
+                        )
 
-                with col2:
-                    branch_options = get_sorted_unique_values(df, 'Select Branch/Discipline')
-                    selected_branches = st.multiselect(
-                        "Branch/Discipline",
-                        options=branch_options,
-                        default=branch_options
-                    )
+                    with col2:
+                        branch_options = get_sorted_unique_values(df, 'Select Branch/Discipline')
+                        selected_branches = st.multiselect(
+                            "Branch/Discipline",
+                            options=branch_options,
+                            default=branch_options
+                        )
 
-                    section_type_options = get_sorted_unique_values(df, 'Section Type')
-                    selected_section_types = st.multiselect(
-                        "Section Type",
-                        options=section_type_options,
-                        default=section_type_options
-                    )
+                        section_type_options = get_sorted_unique_values(df, 'Section Type')
+                        selected_section_types = st.multiselect(
+                            "Section Type",
+                            options=section_type_options,
+                            default=section_type_options
+                        )
 
-            # Apply filters
-            mask = (
-                (df['Timestamp'] >= from_date) &
-                (df['Timestamp'] <= to_date) &
-                (df['Choose your Current/Last Academic Year and Semester'].isin(selected_year_semesters)) &
-                (df['Gender'].isin(selected_genders)) &
-                (df['Select Branch/Discipline'].isin(selected_branches)) &
-                (df['Section Type'].isin(selected_section_types))
-            )
-            filtered_df = df.loc[mask]
-
-            # Calculate scores
-            average_scores, subject_scores = calculate_average_scores(filtered_df)
-
-            # Display statistics in a metric container
-            total_responses = len(filtered_df)
+                submitted = st.form_submit_button("Apply Filters")
+
+            # Recompute only on submit or on first sight of a new file;
+            # other reruns (tab and report widgets) reuse stored results
+            file_id = uploaded_file.file_id
+            if submitted or st.session_state.get('results_file_id') != file_id:
+                # Apply filters, fused in one reduction into a preallocated
+                # mask instead of ANDing pairwise Series temporaries
+                ts = df['Timestamp'].to_numpy()
+                mask = np.empty(len(df), dtype=bool)
+                np.logical_and.reduce([
+                    ts >= np.datetime64(from_date),
+                    ts <= np.datetime64(to_date),
+                    df['Choose your Current/Last Academic Year and Semester'].isin(selected_year_semesters).to_numpy(),
+                    df['Gender'].isin(selected_genders).to_numpy(),
+                    df['Select Branch/Discipline'].isin(selected_branches).to_numpy(),
+                    df['Section Type'].isin(selected_section_types).to_numpy()
+                ], out=mask)
+                filtered_df = df.loc[mask]
+
+                average_scores, subject_scores = calculate_average_scores(filtered_df, col_subjects)
+                st.session_state['results_file_id'] = file_id
+                st.session_state['results'] = (average_scores, subject_scores, len(filtered_df))
+
+            average_scores, subject_scores, total_responses = st.session_state['results']
+            distributions = compute_distributions(subject_scores)
             st.metric("Total Responses", total_responses)
 
             if average_scores:
-                scores_data = []
-                for subject, avg_score in average_scores.items():
-                    num_responses = len(subject_scores[subject])
-                    scores_data.append({
-                        'Subject': subject,
-                        'Average Score': round(avg_score, 2),
-                        'Number of Responses': num_responses,
-                        'Response Rate (%)': round((num_responses / total_responses) * 100, 1)
-                    })
-
-                scores_df = pd.DataFrame(scores_data)
-                scores_df = scores_df.sort_values('Average Score', ascending=False)
+                # Build the table from pre-typed columnar arrays instead of
+                # a list of per-subject dicts
+                names = np.array(list(average_scores))
+                avgs = np.fromiter(average_scores.values(), dtype=np.float64, count=len(names))
+                num_responses = np.fromiter(
+                    (len(subject_scores[s]) for s in names), dtype=np.int32, count=len(names))
+                scores_df = pd.DataFrame({
+                    'Subject': names,
+                    'Average Score': np.round(avgs, 2),
+                    'Number of Responses': num_responses,
+                    'Response Rate (%)': np.round(num_responses / total_responses * 100, 1)
+                }).sort_values('Average Score', ascending=False, kind='stable')
 
                 # Display scores in a clean table
                 st.markdown("### 📊 Subject Performance Overview")
-                st.dataframe(
-                    scores_df.style.background_gradient(subset=['Average Score'], cmap='RdYlGn'),
-                    hide_index=True,
-                    use_container_width=True
-                )
+                st.markdown(render_scores_table(scores_df), unsafe_allow_html=True)
 
                 # Create tabs for different visualizations
                 tab1, tab2 = st.tabs(["📈 Score Distribution", "📋 Detailed Breakdown"])
@@ -255,52 +334,59 @@ def main():
                         default=scores_df['Subject'].iloc[0]
                     )
 
-                    for subject in selected_subjects:
-                        scores = subject_scores[subject]
-                        score_dist = pd.Series(scores).value_counts().sort_index()
-                        total = sum(score_dist.values)
-                        score_percentages = (score_dist / total * 100).round(1)
-
-                        dist_df = pd.DataFrame({
-                            'Score': score_dist.index,
-                            'Count': score_dist.values,
-                            'Percentage': score_percentages.values
-                        })
-                        dist_df = dist_df.sort_values('Score')
-
+                    if selected_subjects:
+                        frames = []
+                        for subject in selected_subjects:
+                            counts, percentages = distributions[subject]
+                            present = counts > 0
+                            frames.append(pd.DataFrame({
+                                'Score': np.arange(1, 6)[present],
+                                'Count': counts[present],
+                                'Percentage': percentages[present],
+                                'Subject': subject
+                            }))
+
+                        # One faceted figure ships a single plotly payload
+                        # to the browser instead of a chart per subject
+                        dist_long = pd.concat(frames, ignore_index=True)
                         fig = px.bar(
-                            dist_df,
+                            dist_long,
                             x='Score',
                             y='Count',
                             text='Percentage',
                             labels={'Count': 'Number of Responses', 'Score': 'Rating Score'},
-                            title=f'{subject} - Score Distribution',
+                            facet_col='Subject',
+                            facet_col_wrap=3,
                             color='Score',
                             color_continuous_scale='RdYlBu'
                         )
                         fig.update_traces(texttemplate='%{text}%', textposition='outside')
                         fig.update_layout(
                             showlegend=False,
-                            height=400,
+                            autosize=False,
                             margin=dict(l=20, r=20, t=40, b=20)
                         )
-                        st.plotly_chart(fig, use_container_width=True)
+                        # Read-only chart: skip the modebar and the
+                        # interactivity/resize wiring in the browser
+                        st.plotly_chart(
+                            fig,
+                            use_container_width=True,
+                            config={'staticPlot': True, 'displayModeBar': False}
+                        )
 
                 with tab2:
                     for subject in scores_df['Subject']:
                         st.subheader(subject)
-                        scores = subject_scores[subject]
-                        score_dist = pd.Series(scores).value_counts().sort_index()
-                        total = sum(score_dist.values)
-                        score_percentages = (score_dist / total * 100).round(1)
+                        counts, percentages = distributions[subject]
+                        present = counts > 0
 
                         dist_df = pd.DataFrame({
-                            'Score': score_dist.index,
-                            'Count': score_dist.values,
-                            'Percentage': score_percentages.values
+                            'Score': np.arange(1, 6)[present],
+                            'Count': counts[present],
+                            'Percentage': percentages[present]
                         })
                         st.dataframe(
-                            dist_df.sort_values('Score'),
+                            dist_df,
                             hide_index=True,
                             use_container_width=True
                         )
@@ -314,15 +400,16 @@ def main():
                 )
 
                 if st.button("Generate PDF Report", key="generate_report"):
-                    pdf = create_pdf_report(scores_df, subject_scores, report_subjects)
+                    # Cached, so regenerating the same selection is instant
+                    pdf_bytes = pdf_report_bytes(scores_df, distributions, report_subjects)
                     
-                    # Save PDF to bytes
-                    pdf_bytes = pdf.output(dest='S').encode('latin1')
-                    
-                    # Create download button
-                    b64_pdf = base64.b64encode(pdf_bytes).decode('utf-8')
-                    href = f'<a href="data:application/pdf;base64,{b64_pdf}" download="faculty_rating_report.pdf" class="download-btn"><button style="padding: 0.5rem 1rem; background-color: #4CAF50; color: white; border: none; border-radius: 4px; cursor: pointer;">Download PDF Report</button></a>'
-                    st.markdown(href, unsafe_allow_html=True)
+                    # Streamlit streams the raw bytes; no base64 copy
+                    st.download_button(
+                        "Download PDF Report",
+                        data=pdf_bytes,
+                        file_name="faculty_rating_report.pdf",
+                        mime="application/pdf"
+                    )
 
             else:
                 st.warning("No subjects with scores found after filtering.")
@@ -0,0 +1,423 @@
+"""Shared implementation behind app.py / app3.py / app4.py / app5.py.
+
+The four entry points were near-duplicates; keeping one module means one
+import/bytecode footprint and one set of st.cache_data entries shared
+across the variants.
+"""
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.express as px
+import io
+import re
+import array
+import openpyxl
+
+# Matches the "Subjects [<name>]" / "Subject [<name>]" column-header patterns
+SUBJECT_RE = re.compile(r'Subjects?\s*\[(.+?)\]')
+
+# Rating -> int8 code used while streaming the workbook; code + 1
+# gives the numeric score, -1 marks missing or unrecognised cells
+RATING_CODES = {'Poor': 0, 'Fair': 1, 'Good': 2, 'Very Good': 3, 'Excellent': 4}
+
+FILTER_COLS = [
+    'Choose your Current/Last Academic Year and Semester',
+    'Gender',
+    'Select Branch/Discipline',
+    'Section Type'
+]
+
+CUSTOM_CSS = """
+    <style>
+    .main {
+        padding: 1rem;
+    }
+    .stButton>button {
+        width: 100%;
+    }
+    .css-1d391kg {
+        padding-top: 1rem;
+    }
+    .sidebar .sidebar-content {
+        width: 300px;
+    }
+    </style>
+"""
+
+
+def get_sorted_unique_values(df, column):
+    """Get sorted unique values from a column, handling NaN values"""
+    # Categorical columns already carry their sorted unique values
+    if isinstance(df[column].dtype, pd.CategoricalDtype):
+        return df[column].cat.categories.tolist()
+    # Keep the values in a NumPy array and sort in C, no Python object list
+    unique_values = pd.unique(df[column].dropna().to_numpy())
+    return np.sort(unique_values).tolist() if len(unique_values) else []
+
+
+@st.cache_data(show_spinner=False)
+def load_df(file_bytes):
+    """Stream the workbook row by row, keeping only the used columns.
+
+    Ratings are accumulated directly as int8 codes, so memory stays
+    proportional to the kept columns rather than the full sheet.
+    """
+    wb = openpyxl.load_workbook(io.BytesIO(file_bytes), read_only=True, data_only=True)
+    ws = wb.active
+    rows = ws.iter_rows(values_only=True)
+    header = ['' if cell is None else str(cell) for cell in next(rows)]
+
+    ts_idx = header.index('Timestamp')
+    filter_idx = {col: header.index(col) for col in FILTER_COLS if col in header}
+    subject_idx = [i for i, col in enumerate(header) if SUBJECT_RE.search(col)]
+
+    timestamps = []
+    filter_values = {col: [] for col in filter_idx}
+    rating_codes = {header[i]: array.array('b') for i in subject_idx}
+
+    for row in rows:
+        timestamps.append(row[ts_idx])
+        for col, i in filter_idx.items():
+            filter_values[col].append(row[i])
+        for i in subject_idx:
+            rating_codes[header[i]].append(RATING_CODES.get(row[i], -1))
+    wb.close()
+
+    data = {'Timestamp': pd.to_datetime(timestamps)}
+    for col, values in filter_values.items():
+        # Category dtype stores each distinct string once; the filter
+        # mask's .isin() then compares integer codes, not Python strings
+        data[col] = pd.Categorical(values)
+    for col, codes in rating_codes.items():
+        data[col] = np.frombuffer(codes, dtype=np.int8)
+    return pd.DataFrame(data)
+
+
+@st.cache_data(show_spinner=False)
+def filter_options(df):
+    # Unique filter values only change per upload; reruns reuse the cache
+    return {col: get_sorted_unique_values(df, col) for col in FILTER_COLS}
+
+
+@st.cache_data(show_spinner=False)
+def subject_layout(columns, normalize_names):
+    """Locate subject columns once per upload; filter reruns reuse the cache"""
+    cols = pd.Index(columns)
+    names = cols.str.extract(SUBJECT_RE, expand=False)
+    subject_mask = names.notna()
+    subject_cols = cols[subject_mask].tolist()
+
+    names = names[subject_mask]
+    if normalize_names:
+        # Normalize names in one vectorized pass: trim, uppercase, collapse spaces
+        names = names.str.strip().str.upper().str.replace(r'\s+', ' ', regex=True)
+    group_ids, group_names = pd.factorize(names)
+    return subject_cols, group_ids, list(group_names)
+
+
+@st.cache_data(show_spinner=False)
+def calculate_average_scores(df, mask, layout):
+    average_scores = {}
+    subject_scores = {}
+
+    subject_cols, group_ids, group_names = layout
+    if not subject_cols:
+        return average_scores, subject_scores
+
+    # Subject columns already hold int8 codes from the streaming loader;
+    # slicing by row mask avoids materializing a filtered DataFrame copy
+    codes = df[subject_cols].to_numpy()[mask]
+    valid = codes >= 0
+    vals = (codes + 1).astype(np.int32)
+
+    # Per-column sums/counts, folded together per subject with bincount;
+    # int32 is plenty for sums of 1..5 scores and keeps the arrays compact
+    col_sums = np.where(valid, vals, 0).sum(axis=0, dtype=np.int32)
+    col_counts = valid.sum(axis=0, dtype=np.int32)
+    sums = np.bincount(group_ids, weights=col_sums, minlength=len(group_names)).astype(np.int32)
+    counts = np.bincount(group_ids, weights=col_counts, minlength=len(group_names)).astype(np.int32)
+
+    for group_id, subject_name in enumerate(group_names):
+        if counts[group_id]:
+            average_scores[subject_name] = np.float32(sums[group_id]) / counts[group_id]
+            group_cols = group_ids == group_id
+            subject_scores[subject_name] = vals[:, group_cols][valid[:, group_cols]].astype(np.int8)
+
+    return average_scores, subject_scores
+
+
+def build_dist_df(scores):
+    # Scores are bounded ints 1..5, so bincount replaces value_counts + sort
+    # (counts come out in score order)
+    counts = np.bincount(scores, minlength=6)[1:].astype(np.int32)
+    total = counts.sum()
+    # Keep percentages float64: one-decimal values like 22.7 are not
+    # representable in float32 and would render noisy chart labels
+    percentages = np.round(counts / total * 100, 1)
+    nonzero = counts > 0
+    return pd.DataFrame({
+        'Score': np.arange(1, 6)[nonzero],
+        'Count': counts[nonzero],
+        'Percentage': percentages[nonzero]
+    })
+
+
+def _sidebar_filters(df, options):
+    """Sidebar filter widgets; returns the fused boolean row mask."""
+    st.sidebar.header("Filters")
+
+    st.sidebar.subheader("Filter by Date")
+    min_date = df['Timestamp'].min().date()
+    max_date = df['Timestamp'].max().date()
+    from_date = st.sidebar.date_input("From Date", value=min_date)
+    to_date = st.sidebar.date_input("To Date", value=max_date)
+
+    st.sidebar.subheader("Filter by Year and Semester")
+    year_semester_options = options['Choose your Current/Last Academic Year and Semester']
+    selected_year_semesters = st.sidebar.multiselect(
+        "Select Year and Semester",
+        options=year_semester_options,
+        default=year_semester_options
+    )
+
+    st.sidebar.subheader("Filter by Gender")
+    gender_options = options['Gender']
+    selected_genders = st.sidebar.multiselect("Select Gender", options=gender_options, default=gender_options)
+
+    st.sidebar.subheader("Filter by Branch")
+    branch_options = options['Select Branch/Discipline']
+    selected_branches = st.sidebar.multiselect("Select Branch/Discipline", options=branch_options, default=branch_options)
+
+    st.sidebar.subheader("Filter by Section Type")
+    section_type_options = options['Section Type']
+    selected_section_types = st.sidebar.multiselect("Select Section Type", options=section_type_options, default=section_type_options)
+
+    return _build_mask(df, from_date, to_date, selected_year_semesters,
+                       selected_genders, selected_branches, selected_section_types)
+
+
+def _inline_filters(df, options):
+    """Date columns plus an expander of filters; returns the fused row mask."""
+    col1, col2 = st.columns(2)
+    min_date = df['Timestamp'].min().date()
+    max_date = df['Timestamp'].max().date()
+
+    with col1:
+        from_date = st.date_input("From Date", value=min_date)
+    with col2:
+        to_date = st.date_input("To Date", value=max_date)
+
+    with st.expander("📌 Additional Filters", expanded=False):
+        col1, col2 = st.columns(2)
+
+        with col1:
+            year_semester_options = options['Choose your Current/Last Academic Year and Semester']
+            selected_year_semesters = st.multiselect(
+                "Year and Semester",
+                options=year_semester_options,
+                default=year_semester_options
+            )
+
+            gender_options = options['Gender']
+            selected_genders = st.multiselect(
+                "Gender",
+                options=gender_options,
+                default=gender_options
+            )
+
+        with col2:
+            branch_options = options['Select Branch/Discipline']
+            selected_branches = st.multiselect(
+                "Branch/Discipline",
+                options=branch_options,
+                default=branch_options
+            )
+
+            section_type_options = options['Section Type']
+            selected_section_types = st.multiselect(
+                "Section Type",
+                options=section_type_options,
+                default=section_type_options
+            )
+
+    return _build_mask(df, from_date, to_date, selected_year_semesters,
+                       selected_genders, selected_branches, selected_section_types)
+
+
+def _build_mask(df, from_date, to_date, selected_year_semesters,
+                selected_genders, selected_branches, selected_section_types):
+    from_date = pd.to_datetime(from_date)
+    to_date = pd.to_datetime(to_date) + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
+
+    # Fusing the boolean arrays with one reduce avoids pairwise Series temporaries
+    ts = df['Timestamp'].to_numpy()
+    return np.logical_and.reduce([
+        ts >= np.datetime64(from_date),
+        ts <= np.datetime64(to_date),
+        df['Choose your Current/Last Academic Year and Semester'].isin(selected_year_semesters).to_numpy(),
+        df['Gender'].isin(selected_genders).to_numpy(),
+        df['Select Branch/Discipline'].isin(selected_branches).to_numpy(),
+        df['Section Type'].isin(selected_section_types).to_numpy()
+    ])
+
+
+def _show_plain_results(average_scores, subject_scores):
+    """Text-only output used by the basic entry points."""
+    st.header("Average Scores for Each Subject")
+    if average_scores:
+        for subject, score in average_scores.items():
+            st.write(f"{subject}: {score:.2f}")
+    else:
+        st.write("No subjects with scores found after filtering.")
+
+    st.header("Individual Scores for Each Subject")
+    if subject_scores:
+        for subject, scores in subject_scores.items():
+            st.write(f"{subject}: {scores.tolist()}")
+    else:
+        st.write("No individual scores found after filtering.")
+
+
+def _scores_table(average_scores, subject_scores, total_responses):
+    scores_data = []
+    for subject, avg_score in average_scores.items():
+        num_responses = len(subject_scores[subject])
+        scores_data.append({
+            'Subject': subject,
+            'Average Score': round(avg_score, 2),
+            'Number of Responses': num_responses,
+            'Response Rate (%)': round((num_responses / total_responses) * 100, 1)
+        })
+    return pd.DataFrame(scores_data).sort_values('Average Score', ascending=False)
+
+
+def _facet_figure(long_df, color=False):
+    # One faceted figure serializes a single chart instead of
+    # shipping a separate plotly component per subject
+    kwargs = {}
+    if color:
+        kwargs = {'color': 'Score', 'color_continuous_scale': 'RdYlBu'}
+    fig = px.bar(long_df, x='Score', y='Count', text='Percentage',
+                 labels={'Count': 'Number of Responses', 'Score': 'Rating Score'},
+                 facet_col='Subject', facet_col_wrap=4, **kwargs)
+    fig.update_traces(texttemplate='%{text}%', textposition='outside')
+    return fig
+
+
+def _show_plot_results(average_scores, subject_scores, total_responses, tabbed):
+    """Table + faceted distribution chart used by the plotting entry points."""
+    if not average_scores:
+        if tabbed:
+            st.warning("No subjects with scores found after filtering.")
+        else:
+            st.write("No subjects with scores found after filtering.")
+        return
+
+    scores_df = _scores_table(average_scores, subject_scores, total_responses)
+
+    # Compute each subject's distribution once; every view reuses it
+    dist_frames = {subject: build_dist_df(subject_scores[subject])
+                   for subject in scores_df['Subject']}
+    long_df = pd.concat(
+        [dist_frames[subject].assign(Subject=subject)
+         for subject in scores_df['Subject']],
+        ignore_index=True
+    )
+
+    if tabbed:
+        st.markdown("### 📊 Subject Performance Overview")
+        st.dataframe(
+            scores_df.style.background_gradient(subset=['Average Score'], cmap='RdYlGn'),
+            hide_index=True,
+            use_container_width=True
+        )
+
+        tab1, tab2 = st.tabs(["📈 Score Distribution", "📋 Detailed Breakdown"])
+        with tab1:
+            fig = _facet_figure(long_df, color=True)
+            fig.update_layout(
+                showlegend=False,
+                margin=dict(l=20, r=20, t=40, b=20)
+            )
+            st.plotly_chart(fig, use_container_width=True)
+        with tab2:
+            for subject in scores_df['Subject']:
+                st.subheader(subject)
+                st.dataframe(
+                    dist_frames[subject],
+                    hide_index=True,
+                    use_container_width=True
+                )
+    else:
+        st.header("Average Scores for Each Subject")
+        st.dataframe(scores_df, hide_index=True)
+
+        st.header("Score Distribution by Subject")
+        st.plotly_chart(_facet_figure(long_df), use_container_width=True)
+
+        for subject in scores_df['Subject']:
+            st.subheader(subject)
+            st.write("Detailed Score Distribution:")
+            st.dataframe(dist_frames[subject], hide_index=True)
+
+
+def run(show_plots=False, normalize_names=False, custom_css=False):
+    """Render one app variant.
+
+    show_plots adds the scores table and faceted distribution chart,
+    normalize_names folds subject-name spelling variants together, and
+    custom_css selects the wide tabbed layout with page config and CSS.
+    """
+    if custom_css:
+        st.set_page_config(
+            page_title="Faculty Rating Analysis",
+            page_icon="📊",
+            layout="wide"
+        )
+        st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+        st.title("📊 Subject Faculty Rating Analysis")
+        with st.container():
+            st.markdown("### 📁 Upload Data")
+            uploaded_file = st.file_uploader("Upload your Excel file", type=["xlsx"])
+    else:
+        st.title("Subject Faculty Rating Calculator")
+        uploaded_file = st.file_uploader("Upload your Excel file", type=["xlsx"])
+
+    if uploaded_file:
+        try:
+            # Parse only when a new file arrives; later reruns reuse session state
+            file_id = uploaded_file.file_id
+            if st.session_state.get('file_id') != file_id:
+                df = load_df(uploaded_file.getvalue())
+                st.session_state['file_id'] = file_id
+                st.session_state['df'] = df
+                st.session_state['layout'] = subject_layout(tuple(df.columns), normalize_names)
+                st.session_state['options'] = filter_options(df)
+            df = st.session_state['df']
+            layout = st.session_state['layout']
+            options = st.session_state['options']
+
+            if custom_css:
+                mask = _inline_filters(df, options)
+            else:
+                mask = _sidebar_filters(df, options)
+
+            average_scores, subject_scores = calculate_average_scores(df, mask, layout)
+            total_responses = int(mask.sum())
+
+            if custom_css:
+                st.metric("Total Responses", total_responses)
+            elif show_plots:
+                st.header("Response Statistics")
+                st.write(f"Total number of responses after filtering: {total_responses}")
+
+            if show_plots:
+                _show_plot_results(average_scores, subject_scores, total_responses,
+                                   tabbed=custom_css)
+            else:
+                _show_plain_results(average_scores, subject_scores)
+
+        except Exception as e:
+            st.error(f"An error occurred: {str(e)}")
+            st.exception(e)